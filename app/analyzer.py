@@ -5,90 +5,221 @@ OPTIMIZED FOR SERIOUS B2B CONSULTING TONE
 """
 
 import os
-import json
-from typing import Dict, List, Optional
-from openai import OpenAI
-from .sources_database import get_sources_for_industry, format_sources_for_prompt
+import time
+import logging
+import asyncio
+import hashlib
+import functools
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Literal, NamedTuple, Optional, Tuple, Union
+import httpx
+import numpy as np
+import orjson
+from openai import APIConnectionError, APITimeoutError, AsyncOpenAI, ContentFilterFinishReasonError, DefaultAsyncHttpxClient, LengthFinishReasonError, RateLimitError
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+from tenacity import before_sleep_log, retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+from .sources_database import get_sources_prompt_for_industry
 
-class AIAnalyzer:
-    """AI-powered website analysis using OpenAI GPT-4"""
-    
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.model = "gpt-4o-2024-08-06"  # Structured Outputs support
-        
-    def analyze(self, crawler_data: dict, industry: str, company_name: str = "") -> dict:
-        """
-        Analyze website data and calculate ROI using OpenAI GPT-4
-        """
-        
-        # Get relevant sources for this industry
-        sources = get_sources_for_industry(industry)
-        sources_text = format_sources_for_prompt(sources)
-        
-        # Build system prompt
-        system_prompt = self._build_system_prompt(industry, sources_text)
-        
-        # Build user prompt with crawler data
-        user_prompt = self._build_user_prompt(crawler_data, company_name, industry)
-        
-        # Define JSON Schema for Structured Outputs
-        response_schema = self._get_response_schema()
-        
-        try:
-            # Call OpenAI API with Structured Outputs
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "website_analysis",
-                        "strict": True,
-                        "schema": response_schema
-                    }
-                },
-                # WICHTIG: Temperature gesenkt für seriösere, deterministische Antworten
-                temperature=0.4, 
-                max_tokens=3000
+logger = logging.getLogger(__name__)
+
+# Process-wide OpenAI client, created lazily so every analyzer instance shares
+# one connection pool (TLS sessions and keep-alive sockets are reused)
+_CLIENT: Optional[AsyncOpenAI] = None
+
+
+def _get_client() -> AsyncOpenAI:
+    """Return the shared AsyncOpenAI client, creating it on first use"""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            # Default for embeddings/files/batches; completions pass their own
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            # Retries are owned by tenacity (_generate_with_retry) and the
+            # batch processor; SDK retries would stack on top of them
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                # Concurrent requests multiplex over one TLS connection
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=50,
+                    keepalive_expiry=60
+                )
             )
-            
-            # Parse response
-            analysis = json.loads(response.choices[0].message.content)
-            
-            # Add metadata
-            analysis["model"] = self.model
-            analysis["industry"] = industry
-            analysis["company_name"] = company_name
-            
-            return analysis
-            
-        except Exception as e:
-            print(f"OpenAI API Error: {e}")
-            return self._fallback_analysis(crawler_data, industry)
-    
-    def _build_system_prompt(self, industry: str, sources_text: str) -> str:
-        """Build system prompt with strict consulting persona"""
-        
-        industry_contexts = {
-            "hotel": "Hotellerie (Fokus: Direktbuchungsquote, Rezeptionsentlastung)",
-            "restaurant": "Gastronomie (Fokus: No-Show-Rate, Reservierungsmanagement)",
-            "fitness": "Fitness & Health (Fokus: Lead-Qualifizierung, Mitgliederbindung)",
-            "salon": "Beauty & Wellness (Fokus: Terminauslastung, Ausfallreduktion)",
-            "immobilien": "Real Estate (Fokus: Vorqualifizierung, Reaktionszeit)",
-            "ecommerce": "E-Commerce (Fokus: Warenkorbabbruch, Support-Automatisierung)",
-            "anwalt": "Rechtsberatung (Fokus: Mandantenaufnahme, Ersteinschätzung)",
-            "steuerberater": "Steuerberatung (Fokus: Fristenmanagement, Dokumentenerfassung)",
-            "versicherung": "Versicherungswesen (Fokus: Schadensmeldung, Tarifberatung)",
-            "arzt": "Gesundheitswesen (Fokus: Anamnese, Terminmanagement)"
-        }
-        
-        context = industry_contexts.get(industry.lower(), "Dienstleistungssektor")
-        
-        return f"""Du bist ein Senior Strategy Consultant für Digitale Transformation im Bereich {context}.
+        )
+    return _CLIENT
+
+# Per-attempt timeout (for streamed completions: max. silence between
+# chunks); transient failures are retried before falling back
+_REQUEST_TIMEOUT_SECONDS = 15.0
+TRANSIENT_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError)
+
+# Default number of concurrent completions in analyze_many()
+_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+
+# Exact-match response cache: the same prompt for the same model returns the
+# stored analysis instead of paying another completion. Entries are stored
+# as orjson bytes, so every hit decodes an independent copy and callers
+# cannot mutate nested data of a cached analysis. With ANALYSIS_CACHE_DIR
+# set, entries are also written to a diskcache directory that survives
+# restarts and is shared between worker processes.
+_CACHE_MAXSIZE = 1024
+_CACHE_TTL_SECONDS = 24 * 60 * 60
+_ANALYSIS_CACHE: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+_DISK_CACHE_DIR = os.getenv("ANALYSIS_CACHE_DIR")
+_DISK_CACHE = None
+
+
+def _get_disk_cache():
+    """Open the persistent cache on first use (None when not configured)"""
+    global _DISK_CACHE
+    if _DISK_CACHE is None and _DISK_CACHE_DIR:
+        from diskcache import Cache
+        _DISK_CACHE = Cache(_DISK_CACHE_DIR)
+    return _DISK_CACHE
+
+
+def _disk_get(key: str) -> Optional[bytes]:
+    disk = _get_disk_cache()
+    # diskcache expires entries itself
+    return disk.get(key) if disk is not None else None
+
+
+def _disk_set(key: str, payload: bytes) -> None:
+    disk = _get_disk_cache()
+    if disk is not None:
+        disk.set(key, payload, expire=_CACHE_TTL_SECONDS)
+
+
+def _cache_key(*parts: str) -> str:
+    """Stable digest of the request parts that determine the model output"""
+    return hashlib.blake2b(orjson.dumps(parts), digest_size=16).hexdigest()
+
+
+async def _cache_get(key: str) -> Optional[dict]:
+    entry = _ANALYSIS_CACHE.get(key)
+    if entry is not None:
+        stored_at, payload = entry
+        if time.monotonic() - stored_at <= _CACHE_TTL_SECONDS:
+            _ANALYSIS_CACHE.move_to_end(key)
+            return orjson.loads(payload)
+        del _ANALYSIS_CACHE[key]
+    if not _DISK_CACHE_DIR:
+        return None
+    # SQLite I/O runs in a worker thread; a hit is promoted to memory
+    payload = await asyncio.to_thread(_disk_get, key)
+    if payload is None:
+        return None
+    _cache_store(key, payload)
+    return orjson.loads(payload)
+
+
+async def _cache_put(key: str, analysis: dict) -> None:
+    payload = orjson.dumps(analysis)
+    _cache_store(key, payload)
+    if _DISK_CACHE_DIR:
+        await asyncio.to_thread(_disk_set, key, payload)
+
+
+def _cache_store(key: str, payload: bytes) -> None:
+    _ANALYSIS_CACHE[key] = (time.monotonic(), payload)
+    _ANALYSIS_CACHE.move_to_end(key)
+    while len(_ANALYSIS_CACHE) > _CACHE_MAXSIZE:
+        _ANALYSIS_CACHE.popitem(last=False)
+
+# Semantic cache: on an exact-cache miss, a prompt whose embedding is nearly
+# identical (re-crawl with cosmetic differences) reuses the stored analysis.
+# Only entries with the same model/industry/URL/company/detail scope and the
+# same chatbot/mobile/contact flags can match, so neither two different sites
+# nor a site whose crawl facts changed share an analysis. Page count and
+# languages may drift slightly between crawls of an unchanged site.
+_EMBEDDING_MODEL = "text-embedding-3-small"
+_EMBED_TIMEOUT_SECONDS = 3.0
+_SEMANTIC_CACHE_MAXSIZE = 10_000
+_SEMANTIC_SIMILARITY_THRESHOLD = 0.97
+_SEMANTIC_PAGE_COUNT_TOLERANCE = 0.1
+_SEMANTIC_PAGE_COUNT_MIN_DELTA = 2
+_SEMANTIC_LANGUAGE_TOLERANCE = 1
+
+
+class _SemanticCache:
+    """
+    Exact nearest-neighbour search over normalized prompt embeddings
+    
+    Brute-force inner product on one float32 matrix (what a flat IP index
+    does); slots are reused in LRU order once maxsize is reached.
+    """
+    
+    __slots__ = ("maxsize", "threshold", "_vectors", "_scopes", "_page_counts", "_languages", "_entries", "_lru")
+    
+    def __init__(self, maxsize: int, threshold: float):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._vectors: Optional[np.ndarray] = None
+        self._scopes = np.zeros(maxsize, dtype=np.int64)
+        self._page_counts = np.zeros(maxsize, dtype=np.int64)
+        self._languages: List[FrozenSet[str]] = []
+        self._entries: List[Tuple[float, bytes]] = []
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+    
+    @staticmethod
+    def scope(*parts: str) -> int:
+        return int.from_bytes(hashlib.blake2b(orjson.dumps(parts), digest_size=8).digest(), "little", signed=True)
+    
+    def get(self, vector: np.ndarray, scope: int, page_count: int, languages: FrozenSet[str]) -> Optional[dict]:
+        size = len(self._entries)
+        if not size:
+            return None
+        scores = self._vectors[:size] @ vector
+        scores[self._scopes[:size] != scope] = -1.0
+        max_delta = max(_SEMANTIC_PAGE_COUNT_MIN_DELTA, int(page_count * _SEMANTIC_PAGE_COUNT_TOLERANCE))
+        scores[np.abs(self._page_counts[:size] - page_count) > max_delta] = -1.0
+        candidates = np.flatnonzero(scores >= self.threshold)
+        # Best match first; the language check is per slot
+        for slot in candidates[np.argsort(scores[candidates])[::-1]]:
+            slot = int(slot)
+            if len(self._languages[slot] ^ languages) > _SEMANTIC_LANGUAGE_TOLERANCE:
+                continue
+            stored_at, payload = self._entries[slot]
+            if time.monotonic() - stored_at > _CACHE_TTL_SECONDS:
+                continue
+            self._lru.move_to_end(slot)
+            return orjson.loads(payload)
+        return None
+    
+    def put(
+        self,
+        vector: np.ndarray,
+        scope: int,
+        page_count: int,
+        languages: FrozenSet[str],
+        analysis: dict
+    ) -> None:
+        if self._vectors is None:
+            # Pages are only committed as slots get used
+            self._vectors = np.empty((self.maxsize, vector.shape[0]), dtype=np.float32)
+        if len(self._entries) < self.maxsize:
+            slot = len(self._entries)
+            self._entries.append((time.monotonic(), orjson.dumps(analysis)))
+            self._languages.append(languages)
+        else:
+            slot, _ = self._lru.popitem(last=False)
+            self._entries[slot] = (time.monotonic(), orjson.dumps(analysis))
+            self._languages[slot] = languages
+        self._vectors[slot] = vector
+        self._scopes[slot] = scope
+        self._page_counts[slot] = page_count
+        self._lru[slot] = None
+
+
+_SEMANTIC_CACHE = _SemanticCache(_SEMANTIC_CACHE_MAXSIZE, _SEMANTIC_SIMILARITY_THRESHOLD)
+
+# The complete system prompt, identical for every industry and request. It
+# must stay free of any per-request data so OpenAI's automatic prompt caching
+# can reuse the prefix; industry context follows in a separate message.
+_SYSTEM_PROMPT_HEADER = """Du bist ein Senior Strategy Consultant für Digitale Transformation. Der Branchenfokus des analysierten Unternehmens wird in der folgenden Nachricht unter BRANCHENFOKUS angegeben.
 
 DEINE ROLLE:
 Du analysierst Unternehmen nüchtern, faktenbasiert und kritisch. Dein Ziel ist es, ineffiziente Prozesse aufzudecken und finanzielle Verluste durch fehlende Automatisierung zu quantifizieren.
@@ -108,210 +239,820 @@ Wir bieten eine Enterprise-Grade KI-Lösung zur Prozessautomatisierung.
 - Funktionalität: 24/7 Lead-Erfassung, PMS/CRM-Integration, Mehrsprachigkeit.
 - Pricing (nur für ROI-Referenz): Setup ab €1.799, Monthly ab €249.
 
-QUELLEN FÜR BENCHMARKS:
-{sources_text}
-
 ANALYSE-RICHTLINIEN:
 1. **Pain Points:** Identifiziere operative Engpässe basierend auf den Crawler-Daten (z.B. viele Unterseiten = hoher Info-Bedarf = hohe Support-Last).
-2. **ROI-Berechnung:** Sei KONSERVATIV. Berechne lieber das "Worst-Case"-Szenario, das ist glaubwürdiger. Referenziere IMMER die Source-IDs.
+2. **ROI-Berechnung:** Sei KONSERVATIV. Berechne lieber das "Worst-Case"-Szenario, das ist glaubwürdiger. Referenziere IMMER die Source-IDs aus QUELLEN FÜR BENCHMARKS.
 3. **Empfehlungen:** Keine generischen Tipps. Empfiehl konkrete Prozess-Änderungen.
 
 OUTPUT FORMAT:
 JSON gemäß Schema. ALLE Textausgaben auf Deutsch.
 """
-    
-    def _build_user_prompt(self, crawler_data: dict, company_name: str, industry: str) -> str:
-        """Build user prompt with structured data presentation"""
-        
-        chatbot_status = "Nicht vorhanden"
-        if crawler_data.get("has_chatbot"):
-            chatbot_type = crawler_data.get("chatbot_type", "Unbekannt")
-            chatbot_status = f"Vorhanden (System: {chatbot_type})"
-        
-        # Berechne implizite Metriken für die KI
-        complexity_score = "Hoch" if crawler_data.get('page_count', 0) > 20 else "Mittel"
-        intl_score = "Ja" if len(crawler_data.get('languages', [])) > 1 else "Nein"
-        
-        return f"""ANALYSE-OBJEKT:
-Unternehmen: {company_name or 'Unbekannt'}
+
+# Industry context message; rendered once per industry (see _CONTEXT_PROMPTS)
+_CONTEXT_PROMPT_TEMPLATE = """BRANCHENFOKUS:
+{industry_context}
+
+QUELLEN FÜR BENCHMARKS:
+{sources_context}
+"""
+
+# User prompt layout; only the placeholders vary per site
+_USER_PROMPT_TEMPLATE = """ANALYSE-OBJEKT:
+Unternehmen: {company}
 Branche: {industry}
 
 TECHNISCHE IST-AUFNAHME (CRAWLER DATEN):
 1. Web-Präsenz:
-   - URL: {crawler_data.get('url', 'N/A')}
-   - Struktur-Komplexität: {crawler_data.get('page_count', 0)} indexierte Seiten ({complexity_score})
-   - Internationalisierung: {intl_score} ({', '.join(crawler_data.get('languages', ['Deutsch']))})
-   - Mobile Optimierung: {'Ja' if crawler_data.get('is_mobile_friendly') else 'Nein (Kritisch)'}
+   - URL: {url}
+   - Struktur-Komplexität: {page_count} indexierte Seiten ({complexity})
+   - Internationalisierung: {intl} ({languages})
+   - Mobile Optimierung: {mobile}
 
 2. Interaktions-Kanäle:
-   - Bestehende Automatisierung: {chatbot_status}
-   - Statische Lead-Formulare: {len(crawler_data.get('lead_forms', []))} Stück
-   - Kontakt-Optionen: {'Vorhanden' if crawler_data.get('has_contact_info') else 'Eingeschränkt'}
+   - Bestehende Automatisierung: {chatbot}
+   - Statische Lead-Formulare: {lead_forms} Stück
+   - Kontakt-Optionen: {contact}
 
 AUFGABE:
 Erstelle eine Due-Diligence-Analyse der digitalen Kundeninteraktion.
 Fokussiere dich auf entgangene Umsätze durch fehlende 24/7-Verfügbarkeit und manuelle Prozesskosten.
 """
+_DEFAULT_PROMPT_LANGUAGES = ("Deutsch",)
+_YES_NO = {True: "Ja", False: "Nein"}
+_MOBILE_STATUS = {True: "Ja", False: "Nein (Kritisch)"}
+_CONTACT_STATUS = {True: "Vorhanden", False: "Eingeschränkt"}
+
+# Industry focus line for the BRANCHENFOKUS section of the system prompt
+_INDUSTRY_CONTEXTS = MappingProxyType({
+    "hotel": "Hotellerie (Fokus: Direktbuchungsquote, Rezeptionsentlastung)",
+    "restaurant": "Gastronomie (Fokus: No-Show-Rate, Reservierungsmanagement)",
+    "fitness": "Fitness & Health (Fokus: Lead-Qualifizierung, Mitgliederbindung)",
+    "salon": "Beauty & Wellness (Fokus: Terminauslastung, Ausfallreduktion)",
+    "immobilien": "Real Estate (Fokus: Vorqualifizierung, Reaktionszeit)",
+    "ecommerce": "E-Commerce (Fokus: Warenkorbabbruch, Support-Automatisierung)",
+    "anwalt": "Rechtsberatung (Fokus: Mandantenaufnahme, Ersteinschätzung)",
+    "steuerberater": "Steuerberatung (Fokus: Fristenmanagement, Dokumentenerfassung)",
+    "versicherung": "Versicherungswesen (Fokus: Schadensmeldung, Tarifberatung)",
+    "arzt": "Gesundheitswesen (Fokus: Anamnese, Terminmanagement)"
+})
+_DEFAULT_INDUSTRY_CONTEXT = "Dienstleistungssektor"
+
+
+def _build_context_prompt(industry: str) -> str:
+    """Build the per-industry context message (focus + benchmark sources)"""
+    # Sent as its own message after the static system prompt, so the
+    # system message is byte-identical for every industry
+    return _CONTEXT_PROMPT_TEMPLATE.format_map({
+        "industry_context": _INDUSTRY_CONTEXTS.get(industry, _DEFAULT_INDUSTRY_CONTEXT),
+        "sources_context": get_sources_prompt_for_industry(industry)
+    })
+
+# Context message per known industry, fully rendered at import; any other
+# industry gets the default focus and only the cross-industry ("all") sources
+_CONTEXT_PROMPTS = MappingProxyType({
+    industry: _build_context_prompt(industry) for industry in (*_INDUSTRY_CONTEXTS, "_DEFAULT")
+})
+
+
+# ==================== STRUCTURED OUTPUT MODELS ====================
+# Source of the strict JSON Schemas sent as response_format (extra='forbid'
+# == additionalProperties: false) and of the Batch API result validator.
+# Docstrings and Field descriptions end up in the schema the model sees.
+
+Priority = Literal["HOCH", "MITTEL", "NIEDRIG"]
+
+
+class PainPoint(BaseModel):
+    model_config = ConfigDict(extra="forbid")
     
-    def _get_response_schema(self) -> dict:
-        """Get JSON Schema with professional descriptions"""
-        return {
-            "type": "object",
-            "properties": {
-                "pain_points": {
-                    "type": "array",
-                    "description": "Identifizierte operative Ineffizienzen",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "problem": {
-                                "type": "string",
-                                "description": "Präzise Problembeschreibung (z.B. 'Hohe Ressourcenbindung durch manuelle Qualifizierung')"
-                            },
-                            "impact": {
-                                "type": "string",
-                                "description": "Wirtschaftliche Auswirkung (z.B. 'Verlust von 15% der Leads außerhalb der Geschäftszeiten')"
-                            },
-                            "evidence": {
-                                "type": "string",
-                                "description": "Ableitung aus den technischen Daten"
-                            },
-                            "source_ids": {
-                                "type": "array",
-                                "items": {"type": "string"}
-                            }
-                        },
-                        "required": ["problem", "impact", "evidence", "source_ids"],
-                        "additionalProperties": False
-                    }
-                },
-                "roi_calculation": {
-                    "type": "object",
-                    "description": "Wirtschaftlichkeitsberechnung",
-                    "properties": {
-                        "monthly_roi": {
-                            "type": "number",
-                            "description": "Konservatives monatliches Einsparpotenzial in EUR"
-                        },
-                        "roi_multiplier": {
-                            "type": "number",
-                            "description": "ROI-Faktor (z.B. 4.5)"
-                        },
-                        "break_even_months": {
-                            "type": "number",
-                            "description": "Amortisationsdauer in Monaten"
-                        },
-                        "calculations": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "category": {
-                                        "type": "string",
-                                        "description": "Kostenstelle (z.B. 'Personalkosten Rezeption', 'Lead-Akquise')"
-                                    },
-                                    "monthly_value": {
-                                        "type": "number",
-                                        "description": "Wert in EUR"
-                                    },
-                                    "calculation": {
-                                        "type": "string",
-                                        "description": "Transparente Herleitung der Zahl"
-                                    },
-                                    "source_ids": {
-                                        "type": "array",
-                                        "items": {"type": "string"}
-                                    }
-                                },
-                                "required": ["category", "monthly_value", "calculation", "source_ids"],
-                                "additionalProperties": False
-                            }
-                        }
-                    },
-                    "required": ["monthly_roi", "roi_multiplier", "break_even_months", "calculations"],
-                    "additionalProperties": False
-                },
-                "recommendations": {
-                    "type": "array",
-                    "description": "Strategische Handlungsempfehlungen",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "priority": {
-                                "type": "string",
-                                "enum": ["HOCH", "MITTEL", "NIEDRIG"]
-                            },
-                            "title": {
-                                "type": "string",
-                                "description": "Handlungsfeld"
-                            },
-                            "description": {
-                                "type": "string",
-                                "description": "Maßnahme und Begründung"
-                            },
-                            "impact": {
-                                "type": "string",
-                                "description": "Erwarteter betriebswirtschaftlicher Effekt"
-                            },
-                            "implementation": {
-                                "type": "string",
-                                "description": "Implementierungsschritt"
-                            }
-                        },
-                        "required": ["priority", "title", "description", "impact", "implementation"],
-                        "additionalProperties": False
-                    }
-                },
-                "chatbot_priority": {
-                    "type": "string",
-                    "enum": ["HOCH", "MITTEL", "NIEDRIG"],
-                    "description": "Vertriebspriorität basierend auf Potenzial"
-                }
-            },
-            "required": ["pain_points", "roi_calculation", "recommendations", "chatbot_priority"],
-            "additionalProperties": False
+    problem: str = Field(description="Präzise Problembeschreibung (z.B. 'Hohe Ressourcenbindung durch manuelle Qualifizierung')")
+    impact: str = Field(description="Wirtschaftliche Auswirkung (z.B. 'Verlust von 15% der Leads außerhalb der Geschäftszeiten')")
+    evidence: str = Field(description="Ableitung aus den technischen Daten")
+    source_ids: List[str]
+
+
+class Calculation(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    
+    category: str = Field(description="Kostenstelle (z.B. 'Personalkosten Rezeption', 'Lead-Akquise')")
+    monthly_value: float = Field(description="Wert in EUR")
+    calculation: str = Field(description="Transparente Herleitung der Zahl")
+    source_ids: List[str]
+
+
+class RoiSummary(BaseModel):
+    """Wirtschaftlichkeitsberechnung"""
+    model_config = ConfigDict(extra="forbid")
+    
+    monthly_roi: float = Field(description="Konservatives monatliches Einsparpotenzial in EUR")
+    roi_multiplier: float = Field(description="ROI-Faktor (z.B. 4.5)")
+    break_even_months: float = Field(description="Amortisationsdauer in Monaten")
+
+
+class RoiCalculation(RoiSummary):
+    """Wirtschaftlichkeitsberechnung"""
+    
+    calculations: List[Calculation]
+
+
+class Recommendation(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    
+    priority: Priority
+    title: str = Field(description="Handlungsfeld")
+    description: str = Field(description="Maßnahme und Begründung")
+    impact: str = Field(description="Erwarteter betriebswirtschaftlicher Effekt")
+    implementation: str = Field(description="Implementierungsschritt")
+
+
+class WebsiteAnalysis(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    
+    pain_points: List[PainPoint] = Field(description="Identifizierte operative Ineffizienzen")
+    roi_calculation: RoiCalculation
+    recommendations: List[Recommendation] = Field(description="Strategische Handlungsempfehlungen")
+    chatbot_priority: Priority = Field(description="Vertriebspriorität basierend auf Potenzial")
+
+
+class WebsiteAnalysisSummary(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    
+    roi_calculation: RoiSummary
+    chatbot_priority: Priority = Field(description="Vertriebspriorität basierend auf Potenzial")
+
+
+class WebsiteAnalysisList(BaseModel):
+    """Mehrere Website-Analysen in der Reihenfolge der Eingabe"""
+    model_config = ConfigDict(extra="forbid")
+    
+    analyses: List[WebsiteAnalysis]
+
+
+class WebsiteAnalysisSummaryList(BaseModel):
+    """Mehrere Kurz-Analysen in der Reihenfolge der Eingabe"""
+    model_config = ConfigDict(extra="forbid")
+    
+    analyses: List[WebsiteAnalysisSummary]
+
+
+# Validator for Batch API output lines (the live path gets validated objects
+# from the SDK); pydantic-core compiles it once at import
+_BATCH_RESULT_ADAPTER = TypeAdapter(Union[WebsiteAnalysis, WebsiteAnalysisSummary])
+
+# Rough prompt-size estimate (OpenAI rule of thumb: ~4 characters per token)
+_CHARS_PER_TOKEN = 4
+
+# Upper bound for the combined completion of one multi-site request
+_MULTI_MAX_COMPLETION_TOKENS = 16000
+
+# Batch states after which no further progress happens
+_BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+def _json_schema_format(name: str, model: type) -> dict:
+    """Strict Structured Outputs payload for a response model"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": model.model_json_schema()
+        }
+    }
+
+# response_format payloads, generated once at import. Strict mode makes the
+# API enforce the schema, so answers are used as plain dicts without a
+# second client-side validation pass.
+_RESPONSE_FORMAT = _json_schema_format("website_analysis", WebsiteAnalysis)
+_SUMMARY_RESPONSE_FORMAT = _json_schema_format("website_analysis_summary", WebsiteAnalysisSummary)
+_MULTI_RESPONSE_FORMAT = _json_schema_format("website_analysis_list", WebsiteAnalysisList)
+_MULTI_SUMMARY_RESPONSE_FORMAT = _json_schema_format("website_analysis_summary_list", WebsiteAnalysisSummaryList)
+
+# Part of every cache key: a deploy that changes the system prompt, an
+# industry context/source or the response schema must not be answered with
+# entries (possibly persisted on disk) produced by the previous version
+_CACHE_VERSION = hashlib.blake2b(
+    orjson.dumps([_SYSTEM_PROMPT_HEADER, dict(_CONTEXT_PROMPTS), _RESPONSE_FORMAT, _SUMMARY_RESPONSE_FORMAT]),
+    digest_size=8
+).hexdigest()
+
+# Static part of the fallback pain point; only the evidence depends on the crawl.
+# Kept serialized so every fallback decodes its own plain, mutable copy.
+_FALLBACK_PAIN_POINT = orjson.dumps({
+    "problem": "Ressourcenbindung durch manuelle Anfragenbearbeitung",
+    "impact": "Erhöhte Personalkosten und verlängerte Reaktionszeiten",
+    "source_ids": ["1", "3"]
+})
+
+# Conservative ROI used when the OpenAI call fails. It does not depend on the
+# crawler data, so it is serialized once and decoded per fallback.
+_FALLBACK_ROI_CALCULATION = orjson.dumps({
+    "monthly_roi": 2800,
+    "roi_multiplier": 3.5,
+    "break_even_months": 1.8,
+    "calculations": [
+        {
+            "category": "Reduktion Personalkosten (First-Level-Support)",
+            "monthly_value": 1200,
+            "calculation": "Substitution von 20h/Monat manueller Bearbeitung à €60 (Vollkosten)",
+            "source_ids": ["1"]
+        },
+        {
+            "category": "Umsatzsteigerung durch 24/7 Verfügbarkeit",
+            "monthly_value": 1600,
+            "calculation": "Konversion von 2 zusätzlichen Buchungen/Woche à €200",
+            "source_ids": ["3"]
         }
+    ]
+})
+
+# Fallback recommendations do not vary with the input; copied per fallback
+_FALLBACK_RECOMMENDATIONS = (
+    MappingProxyType({
+        "priority": "HOCH",
+        "title": "Automatisierung der Standardkommunikation",
+        "description": "Implementierung einer KI-Lösung zur Entlastung des Personals von repetitiven Anfragen.",
+        "impact": "Sofortige Reduktion der Ticket-Last um ca. 60-80%",
+        "implementation": "Integration ChatPro AI (Premium)"
+    }),
+)
+
+
+class _CrawlerView(NamedTuple):
+    """Crawler fields used by the analyzer, read once per analyze() call"""
+    url: str
+    page_count: int
+    languages: Tuple[str, ...]
+    is_mobile_friendly: bool
+    has_chatbot: bool
+    chatbot_type: str
+    lead_form_count: int
+    has_contact_info: bool
     
-    def _fallback_analysis(self, crawler_data: dict, industry: str) -> dict:
+    @classmethod
+    def from_crawler_data(cls, data: dict) -> "_CrawlerView":
+        get = data.get
+        return cls(
+            url=get("url", "N/A"),
+            page_count=get("page_count", 0),
+            languages=tuple(get("languages") or ()),
+            is_mobile_friendly=bool(get("is_mobile_friendly")),
+            has_chatbot=bool(get("has_chatbot")),
+            chatbot_type=get("chatbot_type", "Unbekannt"),
+            lead_form_count=len(get("lead_forms") or ()),
+            has_contact_info=bool(get("has_contact_info"))
+        )
+
+
+# Completion budget for detailed analyses. Per-industry caps are to be set
+# from the measured p99 of completion_tokens (logged per industry by
+# _parse_completion); until that data exists every industry uses the safe
+# default, which leaves room for German JSON with the full breakdown.
+MAX_TOKENS_PER_INDUSTRY = MappingProxyType({})
+_DEFAULT_MAX_TOKENS = 3000
+_SUMMARY_MAX_TOKENS = 300
+
+
+class AnalysisRequest(NamedTuple):
+    """Everything needed to run (or fall back from) one analysis"""
+    view: _CrawlerView
+    industry: str
+    company_name: str
+    detail: bool
+    context_prompt: str
+    user_prompt: str
+    cache_key: str
+    
+    @property
+    def messages(self) -> List[dict]:
+        """Static system block, then industry context, then the site data"""
+        return [
+            {"role": "system", "content": _SYSTEM_PROMPT_HEADER},
+            {"role": "user", "content": self.context_prompt},
+            {"role": "user", "content": self.user_prompt}
+        ]
+    
+    @property
+    def prompt_chars(self) -> int:
+        return len(_SYSTEM_PROMPT_HEADER) + len(self.context_prompt) + len(self.user_prompt)
+    
+    @property
+    def max_tokens(self) -> int:
+        if not self.detail:
+            return _SUMMARY_MAX_TOKENS
+        return MAX_TOKENS_PER_INDUSTRY.get(self.industry, _DEFAULT_MAX_TOKENS)
+    
+    @property
+    def estimated_tokens(self) -> int:
+        """Prompt tokens (estimated) plus the completion budget"""
+        return self.prompt_chars // _CHARS_PER_TOKEN + self.max_tokens
+
+
+class AIAnalyzer:
+    """AI-powered website analysis using OpenAI GPT-4"""
+    
+    __slots__ = ("primary_model", "fallback_model", "use_batch_api")
+    
+    def __init__(self, use_batch_api: bool = False):
+        # Structured Outputs support; the large model is only used when the
+        # small one refuses or returns output that fails validation
+        self.primary_model = "gpt-4o-mini"
+        self.fallback_model = "gpt-4o-2024-08-06"
+        # Bulk scans via /v1/batches: 50% cheaper, results within 24h
+        self.use_batch_api = use_batch_api
+    
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Shared OpenAI client, resolved per use so it is recreated after aclose()"""
+        return _get_client()
+    
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared OpenAI client (call on application shutdown)"""
+        global _CLIENT
+        if _CLIENT is not None:
+            await _CLIENT.close()
+            _CLIENT = None
+    
+    async def analyze(self, crawler_data: dict, industry: str, company_name: str = "", detail: bool = True) -> dict:
+        """
+        Analyze website data and calculate ROI using OpenAI GPT-4
+        
+        With detail=False only the ROI headline figures and the chatbot
+        priority are requested (no pain points, recommendations or
+        calculation breakdown), which keeps the completion short.
+        """
+        request = await self.prepare(crawler_data, industry, company_name, detail)
+        if not isinstance(request, AnalysisRequest):
+            return request
+        
+        try:
+            return await self.complete(request, retry_transient=True)
+        except Exception:
+            logger.exception("OpenAI API Error")
+            return self.fallback(request)
+    
+    async def prepare(
+        self,
+        crawler_data: dict,
+        industry: str,
+        company_name: str = "",
+        detail: bool = True
+    ) -> Union[dict, "AnalysisRequest"]:
+        """
+        Resolve an analysis without an API call where possible
+        
+        Returns the finished analysis for a failed crawl (rule-based
+        fallback) or a cache hit; otherwise the AnalysisRequest to pass to
+        complete().
+        """
+        request = self._build_request(crawler_data, industry, company_name, detail)
+        
+        # A failed crawl carries no site data worth a completion
+        if "error" in crawler_data:
+            return self.fallback(request)
+        
+        # Identical prompts (e.g. re-running the same site) are served from cache
+        cached = await _cache_get(request.cache_key)
+        if cached is not None:
+            return cached
+        return request
+    
+    def fallback(self, request: "AnalysisRequest") -> dict:
+        """Rule-based analysis for a request that cannot be completed"""
+        return self._fallback_analysis(request.view, request.industry)
+    
+    def _build_request(self, crawler_data: dict, industry: str, company_name: str, detail: bool) -> "AnalysisRequest":
+        """Build prompts and cache key for one analysis"""
+        
+        # Normalize the industry key once; all lookups below use it as-is
+        industry = industry.lower()
+        
+        # Extract the crawler fields once for all prompt/fallback helpers
+        view = _CrawlerView.from_crawler_data(crawler_data)
+        
+        # Industry context (focus + benchmark sources), pre-rendered at import
+        context_prompt = _CONTEXT_PROMPTS.get(industry, _CONTEXT_PROMPTS["_DEFAULT"])
+        
+        # Build user prompt with crawler data
+        user_prompt = self._build_user_prompt(view, company_name, industry)
+        
+        return AnalysisRequest(
+            view=view,
+            industry=industry,
+            company_name=company_name,
+            detail=detail,
+            context_prompt=context_prompt,
+            user_prompt=user_prompt,
+            cache_key=_cache_key(_CACHE_VERSION, self.primary_model, industry, company_name, str(detail), user_prompt)
+        )
+    
+    async def complete(self, request: "AnalysisRequest", retry_transient: bool = False) -> dict:
+        """
+        Run one analysis completion and cache the parsed result
+        
+        A near-duplicate prompt is answered from the semantic cache first.
+        With retry_transient, rate-limit/connection/timeout errors of the
+        completion are retried with backoff; other API errors raise.
+        """
+        
+        # Near-duplicate prompts (a re-crawl of the same site) reuse the
+        # stored analysis; the embedding is far cheaper than the completion.
+        # Looked up once, outside the retry loop below.
+        view = request.view
+        scope = _SemanticCache.scope(
+            self.primary_model, request.industry, view.url, request.company_name, str(request.detail),
+            str(view.has_chatbot), view.chatbot_type, str(view.is_mobile_friendly), str(view.has_contact_info)
+        )
+        languages = frozenset(view.languages)
+        vector = await self._embed(request.user_prompt)
+        if vector is not None:
+            similar = _SEMANTIC_CACHE.get(vector, scope, view.page_count, languages)
+            if similar is not None:
+                await _cache_put(request.cache_key, similar)
+                return similar
+        
+        generate = self._generate_with_retry if retry_transient else self._generate
+        analysis = await generate(request)
+        
+        await _cache_put(request.cache_key, analysis)
+        if vector is not None:
+            _SEMANTIC_CACHE.put(vector, scope, view.page_count, languages, analysis)
+        return analysis
+    
+    @retry(
+        retry=retry_if_exception_type(TRANSIENT_ERRORS),
+        wait=wait_random_exponential(min=1, max=20),
+        stop=stop_after_attempt(4),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
+    )
+    async def _generate_with_retry(self, request: "AnalysisRequest") -> dict:
+        """_generate() with jittered backoff on transient API errors"""
+        return await self._generate(request)
+    
+    async def _generate(self, request: "AnalysisRequest") -> dict:
+        """
+        Structured analysis from the primary model, else the fallback model
+        
+        A refusal, truncated or filtered answer of the primary model is
+        retried once with the fallback model; after truncation with twice
+        the completion budget. API errors raise.
+        """
+        
+        # Structured Outputs payload (prebuilt at import)
+        response_format = _RESPONSE_FORMAT if request.detail else _SUMMARY_RESPONSE_FORMAT
+        
+        model = self.primary_model
+        max_tokens = request.max_tokens
+        try:
+            analysis = await self._parse_completion(model, request, response_format, max_tokens)
+        except LengthFinishReasonError:
+            logger.warning("%s: output truncated at %d tokens", model, max_tokens)
+            # The same limit would cut the larger model off at the same point
+            max_tokens *= 2
+            analysis = None
+        if analysis is None:
+            logger.warning("%s: no usable structured output, retrying with %s", model, self.fallback_model)
+            model = self.fallback_model
+            analysis = await self._parse_completion(model, request, response_format, max_tokens)
+            if analysis is None:
+                raise ValueError(f"Keine strukturierte Antwort von {model}")
+            logger.info("%s: fallback succeeded", model)
+        
+        # Add metadata
+        analysis["model"] = model
+        analysis["industry"] = request.industry
+        analysis["company_name"] = request.company_name
+        return analysis
+    
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Normalized embedding for the semantic cache; None if unavailable"""
+        try:
+            # A short timeout: a slow embedding must not hold up the completion
+            response = await self.client.embeddings.create(
+                model=_EMBEDDING_MODEL, input=text, timeout=_EMBED_TIMEOUT_SECONDS
+            )
+        except Exception:
+            logger.warning("Embedding failed, semantic cache skipped", exc_info=True)
+            return None
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+    
+    async def _parse_completion(
+        self,
+        model: str,
+        request: "AnalysisRequest",
+        response_format: dict,
+        max_tokens: int
+    ) -> Optional[dict]:
+        """
+        Stream one Structured Outputs completion
+        
+        Returns None on a refusal or content-filter stop; output cut off at
+        max_tokens raises LengthFinishReasonError.
+        """
+        
+        # Call OpenAI API with Structured Outputs; streaming lets the SDK
+        # accumulate the answer while tokens arrive instead of after the fact
+        async with self.client.chat.completions.stream(
+            model=model,
+            messages=request.messages,
+            response_format=response_format,
+            timeout=_REQUEST_TIMEOUT_SECONDS,
+            # WICHTIG: Temperature gesenkt für seriösere, deterministische Antworten
+            temperature=0.4, 
+            max_tokens=max_tokens,
+            # Token usage for the per-industry completion budget statistics
+            stream_options={"include_usage": True}
+        ) as stream:
+            # The SDK raises instead of returning output that was stopped by
+            # the content filter (or cut off at max_tokens, see docstring)
+            try:
+                response = await stream.get_final_completion()
+            except ContentFilterFinishReasonError:
+                logger.warning("%s: output stopped by content filter", model)
+                return None
+        
+        # Strict mode guarantees schema-conform JSON unless the model refuses
+        choice = response.choices[0]
+        if choice.message.refusal:
+            logger.warning("%s refused: %s", model, choice.message.refusal)
+            return None
+        if response.usage is not None:
+            logger.info(
+                "%s: %d completion tokens (industry=%s, detail=%s, limit=%d)",
+                model, response.usage.completion_tokens, request.industry, request.detail, max_tokens
+            )
+        return orjson.loads(choice.message.content)
+    
+    async def analyze_many(self, items: List[Dict], max_concurrency: int = _MAX_CONCURRENCY) -> List[Dict]:
+        """
+        Analyze several websites concurrently
+        
+        Each item holds the keyword arguments for analyze(). At most
+        max_concurrency OpenAI requests are in flight at once (default from
+        OPENAI_MAX_CONCURRENCY); results are returned in input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _run(item: Dict) -> Dict:
+            async with semaphore:
+                return await self.analyze(**item)
+        
+        return await asyncio.gather(*(_run(item) for item in items))
+    
+    async def analyze_multi(
+        self,
+        items: List[Dict],
+        tpm_budget: int = 30000,
+        max_concurrency: int = _MAX_CONCURRENCY
+    ) -> List[dict]:
+        """
+        Analyze several small websites with as few requests as possible
+        
+        Each item holds the keyword arguments for analyze(). Sites of the same
+        industry and detail level share one request whose user message
+        carries all site prompts; groups are sized so their prompt stays below tpm_budget / 6
+        tokens. Single-site groups and failed multi-site answers go through
+        the regular per-site path (with transient-error retries). At most
+        max_concurrency requests are in flight at once. Results are returned
+        in input order.
+        """
+        results: List[Optional[dict]] = [None] * len(items)
+        groups: Dict[Tuple[str, bool], List[Tuple[int, AnalysisRequest]]] = {}
+        
+        for index, item in enumerate(items):
+            request = await self.prepare(**item)
+            if isinstance(request, AnalysisRequest):
+                groups.setdefault((request.industry, request.detail), []).append((index, request))
+            else:
+                results[index] = request
+        
+        prompt_budget = tpm_budget // 6
+        chunks = []
+        for group in groups.values():
+            chunk, chunk_tokens, chunk_completion = [], 0, 0
+            system_tokens = (len(_SYSTEM_PROMPT_HEADER) + len(group[0][1].context_prompt)) // _CHARS_PER_TOKEN
+            for index, request in group:
+                tokens = len(request.user_prompt) // _CHARS_PER_TOKEN
+                if chunk and (system_tokens + chunk_tokens + tokens > prompt_budget
+                              or chunk_completion + request.max_tokens > _MULTI_MAX_COMPLETION_TOKENS):
+                    chunks.append(chunk)
+                    chunk, chunk_tokens, chunk_completion = [], 0, 0
+                chunk.append((index, request))
+                chunk_tokens += tokens
+                chunk_completion += request.max_tokens
+            chunks.append(chunk)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _run_single(index: int, request: AnalysisRequest) -> None:
+            try:
+                async with semaphore:
+                    results[index] = await self.complete(request, retry_transient=True)
+            except Exception:
+                logger.exception("OpenAI API Error")
+                results[index] = self.fallback(request)
+        
+        async def _run_chunk(chunk: List[Tuple[int, AnalysisRequest]]) -> None:
+            if len(chunk) > 1:
+                try:
+                    async with semaphore:
+                        analyses = await self._complete_multi([request for _, request in chunk])
+                    for (index, _), analysis in zip(chunk, analyses):
+                        results[index] = analysis
+                    return
+                except Exception:
+                    logger.exception("Multi-site request failed, analyzing %d sites individually", len(chunk))
+            await asyncio.gather(*(_run_single(index, request) for index, request in chunk))
+        
+        await asyncio.gather(*(_run_chunk(chunk) for chunk in chunks))
+        return results
+    
+    async def _complete_multi(self, requests: List[AnalysisRequest]) -> List[dict]:
+        """
+        One completion for several sites of the same industry and detail level
+        
+        Raises on a refusal, truncated output (LengthFinishReasonError from
+        the SDK) or a mismatching number of analyses.
+        """
+        count = len(requests)
+        user_prompt = (
+            f"Analysiere die folgenden {count} Websites. Jedes Element des JSON-Arrays "
+            f"enthält die vollständige Aufgabe für eine Website.\n"
+            f"Gib genau {count} Analysen in derselben Reihenfolge zurück.\n\n"
+            + orjson.dumps([request.user_prompt for request in requests]).decode()
+        )
+        model = self.primary_model
+        
+        async with self.client.chat.completions.stream(
+            model=model,
+            messages=[
+                *requests[0].messages[:2],
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format=_MULTI_RESPONSE_FORMAT if requests[0].detail else _MULTI_SUMMARY_RESPONSE_FORMAT,
+            timeout=_REQUEST_TIMEOUT_SECONDS,
+            temperature=0.4,
+            max_tokens=sum(request.max_tokens for request in requests)
+        ) as stream:
+            response = await stream.get_final_completion()
+        
+        choice = response.choices[0]
+        if choice.message.refusal:
+            raise ValueError(f"{model}: Anfrage abgelehnt")
+        items = orjson.loads(choice.message.content)["analyses"]
+        if len(items) != count:
+            raise ValueError(f"{model}: erwartet {count} Analysen, erhalten {len(items)}")
+        
+        analyses = []
+        for request, analysis in zip(requests, items):
+            analysis["model"] = model
+            analysis["industry"] = request.industry
+            analysis["company_name"] = request.company_name
+            await _cache_put(request.cache_key, analysis)
+            analyses.append(analysis)
+        return analyses
+    
+    # ==================== BATCH API (NON-INTERACTIVE) ====================
+    
+    async def submit_batch(self, items: List[Dict]) -> str:
+        """
+        Submit many analyses to the OpenAI Batch API and return the batch id
+        
+        Each item holds the keyword arguments for analyze() plus an optional
+        site_id (default: list index) that identifies it in fetch_results().
+        """
+        if not self.use_batch_api:
+            raise RuntimeError("Batch API ist für diesen Analyzer nicht aktiviert (use_batch_api=False)")
+        
+        lines = []
+        for index, item in enumerate(items):
+            request = self._build_request(
+                item["crawler_data"],
+                item["industry"],
+                item.get("company_name", ""),
+                item.get("detail", True)
+            )
+            lines.append(orjson.dumps({
+                "custom_id": str(item.get("site_id", index)),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.primary_model,
+                    "messages": request.messages,
+                    "response_format": _RESPONSE_FORMAT if request.detail else _SUMMARY_RESPONSE_FORMAT,
+                    "temperature": 0.4,
+                    "max_tokens": request.max_tokens
+                }
+            }))
+        
+        batch_file = await self.client.files.create(
+            file=("analyses.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("Batch submitted: %s (%d analyses)", batch.id, len(lines))
+        return batch.id
+    
+    async def poll_batch(self, batch_id: str, interval: float = 60) -> str:
+        """Wait until the batch reaches a terminal state and return its status"""
+        while True:
+            batch = await self.client.batches.retrieve(batch_id)
+            if batch.status in _BATCH_TERMINAL_STATUSES:
+                return batch.status
+            await asyncio.sleep(interval)
+    
+    async def fetch_results(self, batch_id: str) -> Dict[str, Optional[dict]]:
+        """
+        Download the batch output and parse it per site_id
+        
+        Every answer is validated against the response models; failed or
+        invalid entries map to None. The caller adds industry/company
+        metadata or falls back as needed.
+        """
+        batch = await self.client.batches.retrieve(batch_id)
+        results: Dict[str, Optional[dict]] = {}
+        
+        if batch.output_file_id:
+            output = await self.client.files.content(batch.output_file_id)
+            for line in output.content.splitlines():
+                if not line:
+                    continue
+                entry = orjson.loads(line)
+                response = entry.get("response") or {}
+                if response.get("status_code") != 200:
+                    results[entry["custom_id"]] = None
+                    continue
+                body = response["body"]
+                content = body["choices"][0]["message"].get("content")
+                try:
+                    if content is None:
+                        raise ValueError("refusal")
+                    parsed = _BATCH_RESULT_ADAPTER.validate_json(content)
+                except (ValidationError, ValueError):
+                    logger.warning("Batch %s: invalid structured output for %s", batch_id, entry["custom_id"])
+                    results[entry["custom_id"]] = None
+                    continue
+                analysis = parsed.model_dump()
+                analysis["model"] = body.get("model", self.primary_model)
+                results[entry["custom_id"]] = analysis
+        
+        # Requests that failed outright are only listed in the error file
+        if batch.error_file_id:
+            errors = await self.client.files.content(batch.error_file_id)
+            for line in errors.content.splitlines():
+                if line:
+                    results.setdefault(orjson.loads(line)["custom_id"], None)
+        return results
+    
+    def _build_user_prompt(self, view: _CrawlerView, company_name: str, industry: str) -> str:
+        """Build user prompt with structured data presentation"""
+        
+        languages = view.languages or _DEFAULT_PROMPT_LANGUAGES
+        return _USER_PROMPT_TEMPLATE.format_map({
+            "company": company_name or "Unbekannt",
+            "industry": industry,
+            "url": view.url,
+            "page_count": view.page_count,
+            # Berechne implizite Metriken für die KI
+            "complexity": "Hoch" if view.page_count > 20 else "Mittel",
+            "intl": _YES_NO[len(languages) > 1],
+            "languages": ", ".join(languages),
+            "mobile": _MOBILE_STATUS[view.is_mobile_friendly],
+            "chatbot": f"Vorhanden (System: {view.chatbot_type})" if view.has_chatbot else "Nicht vorhanden",
+            "lead_forms": view.lead_form_count,
+            "contact": _CONTACT_STATUS[view.has_contact_info]
+        })
+    
+    def _fallback_analysis(self, view: _CrawlerView, industry: str) -> dict:
         """Fallback analysis with professional tone"""
         return {
             "pain_points": [
                 {
-                    "problem": "Ressourcenbindung durch manuelle Anfragenbearbeitung",
-                    "impact": "Erhöhte Personalkosten und verlängerte Reaktionszeiten",
-                    "evidence": f"Hohes Informationsvolumen ({crawler_data.get('page_count', 0)} Seiten) ohne Automatisierung",
-                    "source_ids": ["1", "3"]
-                }
-            ],
-            "roi_calculation": {
-                "monthly_roi": 2800,
-                "roi_multiplier": 3.5,
-                "break_even_months": 1.8,
-                "calculations": [
-                    {
-                        "category": "Reduktion Personalkosten (First-Level-Support)",
-                        "monthly_value": 1200,
-                        "calculation": "Substitution von 20h/Monat manueller Bearbeitung à €60 (Vollkosten)",
-                        "source_ids": ["1"]
-                    },
-                    {
-                        "category": "Umsatzsteigerung durch 24/7 Verfügbarkeit",
-                        "monthly_value": 1600,
-                        "calculation": "Konversion von 2 zusätzlichen Buchungen/Woche à €200",
-                        "source_ids": ["3"]
-                    }
-                ]
-            },
-            "recommendations": [
-                {
-                    "priority": "HOCH",
-                    "title": "Automatisierung der Standardkommunikation",
-                    "description": "Implementierung einer KI-Lösung zur Entlastung des Personals von repetitiven Anfragen.",
-                    "impact": "Sofortige Reduktion der Ticket-Last um ca. 60-80%",
-                    "implementation": "Integration ChatPro AI (Premium)"
+                    **orjson.loads(_FALLBACK_PAIN_POINT),
+                    "evidence": f"Hohes Informationsvolumen ({view.page_count} Seiten) ohne Automatisierung"
                 }
             ],
+            "roi_calculation": orjson.loads(_FALLBACK_ROI_CALCULATION),
+            # Values are strings, so a shallow copy detaches the result
+            "recommendations": [dict(recommendation) for recommendation in _FALLBACK_RECOMMENDATIONS],
             "chatbot_priority": "MITTEL",
             "model": "fallback",
             "industry": industry
         }
+
+
+@functools.cache
+def get_analyzer() -> AIAnalyzer:
+    """
+    Process-wide AIAnalyzer instance (shares the pooled OpenAI client)
+
+    Callers must not mutate its attributes; create a dedicated AIAnalyzer
+    for non-default settings such as use_batch_api=True.
+    """
+    return AIAnalyzer()
@@ -0,0 +1,119 @@
+"""
+CHATPRO AI ANALYZER - BATCH PROCESSING
+Parallel analysis of many websites with RPM/TPM throttling
+(structure follows the OpenAI Cookbook api_request_parallel_processor)
+"""
+
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, List, Optional
+from openai import RateLimitError
+from .analyzer import TRANSIENT_ERRORS, AIAnalyzer, AnalysisRequest, get_analyzer
+
+logger = logging.getLogger(__name__)
+
+# After a rate-limit error all dispatching pauses this long
+_SECONDS_TO_PAUSE_AFTER_RATE_LIMIT = 15
+
+# Exponential backoff for retried requests: 1s, 2s, 4s, ... capped at 60s
+_BACKOFF_BASE_SECONDS = 1.0
+_BACKOFF_MAX_SECONDS = 60.0
+
+# Dispatcher idle interval while waiting for capacity
+_LOOP_SLEEP_SECONDS = 0.01
+
+
+async def analyze_batch(
+    items: List[Dict],
+    rpm: int,
+    tpm: int,
+    max_attempts: int = 5,
+    max_concurrency: int = 50,
+    analyzer: Optional[AIAnalyzer] = None
+) -> List[Dict]:
+    """
+    Analyze many websites in parallel within the account's rate limits
+
+    Each item holds the keyword arguments for AIAnalyzer.analyze(). Requests
+    are dispatched as soon as both the request budget (rpm) and the token
+    budget (tpm) allow; both refill continuously. Rate-limited, timed-out and
+    connection-failed requests are retried with exponential backoff up to
+    max_attempts (a rate limit also pauses dispatching), any other failure
+    falls back to the rule-based analysis. Results are in input order.
+    """
+    analyzer = analyzer or get_analyzer()
+    results: List[Optional[Dict]] = [None] * len(items)
+    queue = deque()
+
+    # Cache hits and failed crawls never touch the API or the rate-limit budget
+    for index, item in enumerate(items):
+        request = await analyzer.prepare(
+            item["crawler_data"],
+            item["industry"],
+            item.get("company_name", ""),
+            item.get("detail", True)
+        )
+        if isinstance(request, AnalysisRequest):
+            queue.append((index, request, max_attempts))
+        else:
+            results[index] = request
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    in_flight = set()
+    last_rate_limit_error = float("-inf")
+
+    async def _run(index: int, request: AnalysisRequest, attempts_left: int) -> None:
+        nonlocal last_rate_limit_error
+        try:
+            async with semaphore:
+                results[index] = await analyzer.complete(request)
+            return
+        except TRANSIENT_ERRORS as e:
+            # Only a 429 pauses the whole dispatcher; connection errors and
+            # timeouts just requeue this request with the same backoff
+            if isinstance(e, RateLimitError):
+                last_rate_limit_error = time.monotonic()
+            if attempts_left > 1:
+                attempt = max_attempts - attempts_left
+                await asyncio.sleep(min(_BACKOFF_BASE_SECONDS * 2 ** attempt, _BACKOFF_MAX_SECONDS))
+                queue.append((index, request, attempts_left - 1))
+                return
+            logger.error("OpenAI transient error: giving up after %d attempts: %s", max_attempts, e)
+        except Exception:
+            logger.exception("OpenAI API Error")
+        results[index] = analyzer.fallback(request)
+
+    available_request_capacity = float(rpm)
+    available_token_capacity = float(tpm)
+    last_update = time.monotonic()
+
+    while queue or in_flight:
+        if queue:
+            # Refill both budgets for the time elapsed since the last pass
+            now = time.monotonic()
+            elapsed = now - last_update
+            last_update = now
+            available_request_capacity = min(available_request_capacity + rpm * elapsed / 60, rpm)
+            available_token_capacity = min(available_token_capacity + tpm * elapsed / 60, tpm)
+
+            index, request, attempts_left = queue[0]
+            # A single oversized request must still fit into a full bucket
+            tokens = min(request.estimated_tokens, tpm)
+            cooling_down = now - last_rate_limit_error < _SECONDS_TO_PAUSE_AFTER_RATE_LIMIT
+
+            if (not cooling_down
+                    and available_request_capacity >= 1
+                    and available_token_capacity >= tokens):
+                available_request_capacity -= 1
+                available_token_capacity -= tokens
+                queue.popleft()
+                task = asyncio.create_task(_run(index, request, attempts_left))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                continue
+
+        await asyncio.sleep(_LOOP_SLEEP_SECONDS)
+
+    return results
@@ -3,11 +3,32 @@ CHATPRO AI ANALYZER - BREVO CRM INTEGRATION
 Automatically save leads to Brevo CRM
 """
 
-import requests
+import httpx
 import os
 from typing import Dict, Optional
 from datetime import datetime
 
+# CRM tag per chatbot priority; anything unknown is treated as low priority
+_PRIORITY_TAGS = {
+    "HIGH": "high-priority",
+    "MEDIUM": "medium-priority",
+}
+
+# Process-wide HTTP client, created lazily so consecutive lead writes reuse
+# the TLS connection to the Brevo API instead of reconnecting per call
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared Brevo HTTP client, creating it on first use"""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+        )
+    return _CLIENT
+
 class BrevoCRM:
     """
     Brevo (formerly Sendinblue) CRM Integration
@@ -23,7 +44,15 @@ class BrevoCRM:
             "api-key": self.api_key
         }
     
-    def save_lead(
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared Brevo HTTP client (call on application shutdown)"""
+        global _CLIENT
+        if _CLIENT is not None:
+            await _CLIENT.aclose()
+            _CLIENT = None
+    
+    async def save_lead(
         self,
         email: str,
         company_name: str,
@@ -88,16 +117,13 @@ class BrevoCRM:
             if chatbot_type:
                 tags.append(f"has-{chatbot_type.lower()}")
         
-        if chatbot_priority == "HIGH":
-            tags.append("high-priority")
-        elif chatbot_priority == "MEDIUM":
-            tags.append("medium-priority")
-        else:
-            tags.append("low-priority")
+        tags.append(_PRIORITY_TAGS.get(chatbot_priority, "low-priority"))
+        
+        client = _get_client()
         
         try:
             # Create/update contact
-            response = requests.post(
+            response = await client.post(
                 f"{self.base_url}/contacts",
                 headers=self.headers,
                 json=contact_data,
@@ -118,7 +144,7 @@ class BrevoCRM:
                 
                 # Add tags (separate API call)
                 try:
-                    self._add_tags(email, tags)
+                    await self._add_tags(client, email, tags)
                 except:
                     pass  # Tags are optional
                 
@@ -142,7 +168,7 @@ class BrevoCRM:
                     'error': f"Brevo API error ({response.status_code}): {error_msg}"
                 }
                 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             return {
                 'status': 'error',
                 'error': 'Brevo API timeout'
@@ -153,13 +179,13 @@ class BrevoCRM:
                 'error': str(e)
             }
     
-    def _add_tags(self, email: str, tags: list) -> bool:
+    async def _add_tags(self, client: httpx.AsyncClient, email: str, tags: list) -> bool:
         """
         Add tags to contact (internal helper)
         """
         try:
             # Get contact ID first
-            response = requests.get(
+            response = await client.get(
                 f"{self.base_url}/contacts/{email}",
                 headers=self.headers,
                 timeout=5
@@ -169,7 +195,7 @@ class BrevoCRM:
                 contact_id = response.json().get('id')
                 
                 # Add tags
-                tag_response = requests.put(
+                tag_response = await client.put(
                     f"{self.base_url}/contacts/{contact_id}",
                     headers=self.headers,
                     json={"tags": tags},
@@ -8,7 +8,46 @@ from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 from urllib.parse import urlparse, urljoin
 import re
-import time
+
+# Chatbot signatures (original spelling is reported back in the details)
+CHATBOT_SIGNATURES = {
+    "zendesk": ["zdassets.com", "zendesk.com", "$zopim", "zEmbed", "zE("],
+    "tidio": ["tidio.co", "tidiochat", "tidioChatApi"],
+    "intercom": ["intercom.io", "window.Intercom", "Intercom("],
+    "drift": ["drift.com", "window.drift", "drift.load"],
+    "livechat": ["livechatinc.com", "LC_API"],
+    "freshchat": ["freshchat.com", "fcWidget"],
+    "chatbot.com": ["chatbot.com", "chatbot-widget"],
+    "hubspot": ["hubspot", "hs-analytics"],
+    "custom": []
+}
+
+# Lower-cased once at import so detection does not re-lower every signature per page
+_CHATBOT_SIGNATURES_LOWER = tuple(
+    (bot_name, tuple((signature, signature.lower()) for signature in signatures))
+    for bot_name, signatures in CHATBOT_SIGNATURES.items()
+)
+
+_LEAD_FORM_INDICATORS = (
+    "email", "e-mail", "name", "vorname", "nachname",
+    "prechat", "pre-chat", "required", "form"
+)
+
+# Contact extraction patterns, compiled once instead of per crawl
+_EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w{2,}')
+# German + international phone numbers
+_PHONE_RE = re.compile(r'(?:\+49|0049|0)\s*\d{2,4}[\s/-]?\d{3,}[\s/-]?\d{3,}')
+# Common false positives among matched e-mail addresses
+_EMAIL_BLOCKLIST = ("example", "domain", "test", "@sentry")
+
+# Language switcher patterns (link text or href), built once at import
+_LANGUAGE_PATTERNS = (
+    ("de", ("deutsch", "german", "/de/", "/de-")),
+    ("en", ("english", "englisch", "/en/", "/en-")),
+    ("fr", ("français", "french", "/fr/", "/fr-")),
+    ("es", ("español", "spanish", "/es/", "/es-")),
+    ("it", ("italiano", "italian", "/it/", "/it-"))
+)
 
 class WebsiteCrawler:
     """
@@ -21,23 +60,13 @@ class WebsiteCrawler:
     - Contact information extraction
     """
     
+    # One crawler is created per analysis request
+    __slots__ = ("url", "timeout", "domain")
+    
     def __init__(self, url: str, timeout: int = 30):
         self.url = url if url.startswith('http') else f'https://{url}'
         self.timeout = timeout
         self.domain = urlparse(self.url).netloc
-        
-        # Chatbot signatures
-        self.chatbot_signatures = {
-            "zendesk": ["zdassets.com", "zendesk.com", "$zopim", "zEmbed", "zE("],
-            "tidio": ["tidio.co", "tidiochat", "tidioChatApi"],
-            "intercom": ["intercom.io", "window.Intercom", "Intercom("],
-            "drift": ["drift.com", "window.drift", "drift.load"],
-            "livechat": ["livechatinc.com", "LC_API"],
-            "freshchat": ["freshchat.com", "fcWidget"],
-            "chatbot.com": ["chatbot.com", "chatbot-widget"],
-            "hubspot": ["hubspot", "hs-analytics"],
-            "custom": []
-        }
     
     def crawl(self) -> Dict:
         """
@@ -65,6 +94,10 @@ class WebsiteCrawler:
             soup = BeautifulSoup(response.content, 'html.parser')
             html_content = response.text
             
+            pages_count = self._count_pages(soup)
+            mobile_responsive = self._check_mobile(soup)
+            contact_info = self._find_contact_info(html_content)
+            
             # Collect data
             analysis = {
                 "url": self.url,
@@ -76,16 +109,23 @@ class WebsiteCrawler:
                 "has_chatbot": False,
                 "chatbot_details": {},
                 "lead_forms": self._find_lead_forms(soup),
-                "pages_count": self._count_pages(soup),
-                "mobile_responsive": self._check_mobile(soup),
-                "contact_info": self._find_contact_info(html_content),
-                "response_time_ms": int(response.elapsed.total_seconds() * 1000)
+                "pages_count": pages_count,
+                "mobile_responsive": mobile_responsive,
+                "contact_info": contact_info,
+                "response_time_ms": int(response.elapsed.total_seconds() * 1000),
+                # Flat summary fields read by analyzer, pipeline and PDF,
+                # derived once here instead of by every consumer
+                "page_count": pages_count,
+                "is_mobile_friendly": mobile_responsive,
+                "has_contact_info": bool(contact_info["emails"] or contact_info["phones"])
             }
             
             # Detect chatbot
             chatbot_data = self._detect_chatbot(html_content, soup)
             analysis["has_chatbot"] = chatbot_data["detected"]
             analysis["chatbot_details"] = chatbot_data
+            if chatbot_data["detected"]:
+                analysis["chatbot_type"] = chatbot_data["type"]
             
             return analysis
             
@@ -127,9 +167,9 @@ class WebsiteCrawler:
         # Check for chatbot signatures in HTML
         html_lower = html_content.lower()
         
-        for bot_name, signatures in self.chatbot_signatures.items():
-            for signature in signatures:
-                if signature.lower() in html_lower:
+        for bot_name, signatures in _CHATBOT_SIGNATURES_LOWER:
+            for signature, signature_lower in signatures:
+                if signature_lower in html_lower:
                     detected = True
                     chatbot_type = bot_name
                     details["signature_found"] = signature
@@ -139,15 +179,7 @@ class WebsiteCrawler:
         
         # Check for lead form in chatbot
         if detected:
-            lead_form_indicators = [
-                "email", "e-mail", "name", "vorname", "nachname",
-                "prechat", "pre-chat", "required", "form"
-            ]
-            
-            for indicator in lead_form_indicators:
-                if indicator in html_lower:
-                    has_lead_form = True
-                    break
+            has_lead_form = any(indicator in html_lower for indicator in _LEAD_FORM_INDICATORS)
         
         # Priority calculation
         if detected and has_lead_form:
@@ -223,19 +255,12 @@ class WebsiteCrawler:
             text = link.get_text().strip().lower()
             href = link['href'].lower()
             
-            lang_map = {
-                'de': ['deutsch', 'german', '/de/', '/de-'],
-                'en': ['english', 'englisch', '/en/', '/en-'],
-                'fr': ['français', 'french', '/fr/', '/fr-'],
-                'es': ['español', 'spanish', '/es/', '/es-'],
-                'it': ['italiano', 'italian', '/it/', '/it-']
-            }
-            
-            for lang_code, patterns in lang_map.items():
-                if any(pattern in text or pattern in href for pattern in patterns):
+            for lang_code, patterns in _LANGUAGE_PATTERNS:
+                if lang_code not in languages and any(pattern in text or pattern in href for pattern in patterns):
                     languages.add(lang_code)
         
-        return list(languages) if languages else ["de"]  # Default German
+        # Sorted so the same site always yields the same prompt (cache key)
+        return sorted(languages) if languages else ["de"]  # Default German
     
     def _count_pages(self, soup: BeautifulSoup) -> int:
         """
@@ -271,16 +296,11 @@ class WebsiteCrawler:
         Find contact information
         """
         
-        # Email regex
-        emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w{2,}', html_content)
+        emails = _EMAIL_RE.findall(html_content)
         # Filter out common false positives
-        emails = [e for e in emails if not any(x in e.lower() for x in ['example', 'domain', 'test', '@sentry'])]
+        emails = [e for e in emails if not any(x in e.lower() for x in _EMAIL_BLOCKLIST)]
         
-        # Phone regex (German + International)
-        phones = re.findall(
-            r'(?:\+49|0049|0)\s*\d{2,4}[\s/-]?\d{3,}[\s/-]?\d{3,}',
-            html_content
-        )
+        phones = _PHONE_RE.findall(html_content)
         
         return {
             "emails": list(set(emails))[:3],  # Max 3 unique
@@ -333,7 +353,8 @@ def test_crawler():
         print(f"📝 Lead Forms: {len(result.get('lead_forms', []))}")
         print(f"📱 Mobile: {result.get('mobile_responsive')}")
         print(f"🔗 Pages: {result.get('pages_count')}")
-        print(f"📧 Emails: {result.get('contact_info', {}).get('emails', [])}")
+        contact_info = result.get('contact_info')
+        print(f"📧 Emails: {contact_info.get('emails', []) if contact_info else []}")
         print(f"⏱️  Response Time: {result.get('response_time_ms')}ms")
 
 
@@ -5,8 +5,7 @@ Send analysis reports via AWS SES with tracking
 
 import boto3
 from botocore.exceptions import ClientError
-from typing import Dict, Optional
-import os
+from typing import Dict
 from datetime import datetime
 
 class EmailSender:
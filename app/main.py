@@ -5,22 +5,49 @@ FastAPI backend with complete pipeline integration
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
-from pydantic import BaseModel, HttpUrl, EmailStr
+from fastapi.responses import FileResponse, ORJSONResponse
+from pydantic import BaseModel, EmailStr
 from typing import Optional, Literal
+from collections import Counter
+from contextlib import asynccontextmanager
 import os
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 import uuid
-import asyncio
 
 # Import pipeline
 from .pipeline import AnalysisPipeline
+from .analyzer import AIAnalyzer
+from .brevo_crm import BrevoCRM
+
+# Logging: request handlers only enqueue records, the actual stream write
+# happens on the listener's background thread and never blocks the event loop
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(), respect_handler_level=True)
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    handlers=[QueueHandler(_log_queue)]
+)
+_log_listener.start()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release pooled OpenAI/Brevo connections and flush pending log records on shutdown"""
+    yield
+    await AIAnalyzer.aclose()
+    await BrevoCRM.aclose()
+    _log_listener.stop()
 
 # Initialize FastAPI
 app = FastAPI(
     title="ChatPro AI Analyzer",
     description="Kostenlose Website-Analyse für Hotels, Fitness, Salons und mehr",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS Configuration
@@ -241,15 +268,17 @@ async def get_stats():
     """
     
     total = len(analysis_status)
-    completed = sum(1 for s in analysis_status.values() if s["status"] == "completed")
-    processing = sum(1 for s in analysis_status.values() if s["status"] == "processing")
-    failed = sum(1 for s in analysis_status.values() if s["status"] == "failed")
     
-    # Industry breakdown
-    industries = {}
+    # Single pass over all analyses for status and industry breakdown
+    status_counts = Counter()
+    industries = Counter()
     for status in analysis_status.values():
-        industry = status.get("industry", "unknown")
-        industries[industry] = industries.get(industry, 0) + 1
+        status_counts[status["status"]] += 1
+        industries[status.get("industry", "unknown")] += 1
+    
+    completed = status_counts["completed"]
+    processing = status_counts["processing"]
+    failed = status_counts["failed"]
     
     return {
         "total_analyses": total,
@@ -257,14 +286,14 @@ async def get_stats():
         "processing": processing,
         "failed": failed,
         "success_rate": round(completed / total * 100, 1) if total > 0 else 0,
-        "industries": industries
+        "industries": dict(industries)
     }
 
 # Error Handlers
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global error handler"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
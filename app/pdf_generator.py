@@ -3,11 +3,59 @@ CHATPRO AI ANALYZER - MCKINSEY-STYLE PDF REPORT GENERATOR
 Premium Business Consulting Report Layout (German)
 """
 
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Tuple
 from datetime import datetime
 import os
 import uuid
 
+# Shared default when the crawler reports no languages (avoids a fresh list per report)
+_DEFAULT_LANGUAGES = ('Deutsch',)
+
+# Traffic light + label for process efficiency, keyed by chatbot priority
+_EFFICIENCY_SCORES = {
+    "HIGH": ("🔴", "NIEDRIG"),
+    "MEDIUM": ("🟡", "MITTEL"),
+}
+_EFFICIENCY_DEFAULT = ("🟢", "HOCH")
+
+# Industry key -> German industry label on the cover
+_INDUSTRY_LABELS = {
+    "hotel": "Hospitality & Hotellerie",
+    "restaurant": "Gastronomie & Food Service",
+    "fitness": "Health & Fitness",
+    "salon": "Beauty & Wellness",
+    "immobilien": "Immobilien & Real Estate",
+    "ecommerce": "E-Commerce & Retail",
+    "anwalt": "Rechtsberatung & Legal Services",
+    "steuerberater": "Steuerberatung & Audit",
+    "versicherung": "Versicherungswesen",
+    "arzt": "Gesundheitswesen & Healthcare"
+}
+
+# Priority (English or German) -> action-oriented label, and label -> CSS class
+_PRIORITY_LABELS = {'HIGH': 'SOFORT UMSETZEN', 'MEDIUM': 'KURZFRISTIG UMSETZEN', 'LOW': 'STRATEGISCH PLANEN',
+                    'HOCH': 'SOFORT UMSETZEN', 'MITTEL': 'KURZFRISTIG UMSETZEN', 'NIEDRIG': 'STRATEGISCH PLANEN'}
+_PRIORITY_CSS = {'SOFORT UMSETZEN': 'sofort', 'KURZFRISTIG UMSETZEN': 'kurzfristig', 'STRATEGISCH PLANEN': 'strategisch',
+                 'HOCH': 'sofort', 'MITTEL': 'kurzfristig', 'NIEDRIG': 'strategisch'}
+
+
+@lru_cache(maxsize=64)
+def _render_sources_html(entries: Tuple[Tuple, ...]) -> str:
+    """Source list HTML for (id, title, url, year) entries"""
+    parts = []
+    
+    for source_id, title, url, year in entries:
+        parts.append(f"""
+            <div class="source-item">
+                <span class="source-id">[{source_id}]</span> 
+                {title}, {year} — <a href="{url}" target="_blank" style="color: var(--accent-blue);">{url}</a>
+            </div>
+            """)
+    
+    return "".join(parts)
+
+
 class PDFReportGenerator:
     """
     Generate McKinsey-style professional HTML reports in German
@@ -79,7 +127,7 @@ class PDFReportGenerator:
         # Website metrics
         website_check = {
             'pages': crawler_data.get('page_count', 0),
-            'languages': len(crawler_data.get('languages', ['Deutsch'])),
+            'languages': len(crawler_data.get('languages') or _DEFAULT_LANGUAGES),
             'mobile_friendly': crawler_data.get('is_mobile_friendly', True),
             'has_chatbot': crawler_data.get('has_chatbot', False),
             'chatbot_type': crawler_data.get('chatbot_type', 'Nicht vorhanden')
@@ -90,19 +138,7 @@ class PDFReportGenerator:
         report_id = str(uuid.uuid4())[:8].upper()
         
         # Industry mapping to German
-        industry_map = {
-            "hotel": "Hospitality & Hotellerie",
-            "restaurant": "Gastronomie & Food Service",
-            "fitness": "Health & Fitness",
-            "salon": "Beauty & Wellness",
-            "immobilien": "Immobilien & Real Estate",
-            "ecommerce": "E-Commerce & Retail",
-            "anwalt": "Rechtsberatung & Legal Services",
-            "steuerberater": "Steuerberatung & Audit",
-            "versicherung": "Versicherungswesen",
-            "arzt": "Gesundheitswesen & Healthcare"
-        }
-        industry_label = industry_map.get(industry.lower(), industry.capitalize())
+        industry_label = _INDUSTRY_LABELS.get(industry.lower(), industry.capitalize())
         
         # ROI metrics
         monthly_roi = roi_calc.get('monthly_roi', 0)
@@ -116,14 +152,12 @@ class PDFReportGenerator:
         two_year_cost_of_inaction = yearly_cost_of_inaction * 2.15  # Compounding effect
         
         # Priority translation — action-oriented, kein "MITTEL" (Eigentor-Vermeidung)
-        priority_map = {'HIGH': 'SOFORT UMSETZEN', 'MEDIUM': 'KURZFRISTIG UMSETZEN', 'LOW': 'STRATEGISCH PLANEN',
-                        'HOCH': 'SOFORT UMSETZEN', 'MITTEL': 'KURZFRISTIG UMSETZEN', 'NIEDRIG': 'STRATEGISCH PLANEN'}
-        chatbot_priority_de = priority_map.get(chatbot_priority, 'KURZFRISTIG UMSETZEN')
+        chatbot_priority_de = _PRIORITY_LABELS.get(chatbot_priority, 'KURZFRISTIG UMSETZEN')
         
         # Generate HTML sections
         pain_points_html = self._generate_pain_points_html(pain_points)
         roi_details_html = self._generate_roi_details_html(roi_calc)
-        recommendations_html = self._generate_recommendations_html(recommendations, priority_map)
+        recommendations_html = self._generate_recommendations_html(recommendations)
         sources_html = self._generate_sources_html(sources)
         website_analysis_html = self._generate_website_analysis_html(website_check, crawler_data)
         waterfall_chart_html = self._generate_waterfall_chart_html(roi_calc)
@@ -1020,21 +1054,24 @@ class PDFReportGenerator:
     def _generate_scoring_system(self, chatbot_priority: str, website_check: Dict) -> str:
         """Generate traffic light scoring system for different areas"""
         
+        has_chatbot = website_check.get('has_chatbot')
+        pages = website_check.get('pages', 0)
+        languages = website_check.get('languages', 1)
+        
         # Automatisierung Status
-        automation_color = "🔴" if not website_check.get('has_chatbot') else "🟢"
-        automation_status = "KRITISCH" if not website_check.get('has_chatbot') else "GUT"
+        automation_color = "🔴" if not has_chatbot else "🟢"
+        automation_status = "KRITISCH" if not has_chatbot else "GUT"
         
         # Skalierbarkeit
-        scalability_color = "🟡" if website_check.get('pages', 0) > 15 else "🟢"
-        scalability_status = "OPTIMIERBAR" if website_check.get('pages', 0) > 15 else "GUT"
+        scalability_color = "🟡" if pages > 15 else "🟢"
+        scalability_status = "OPTIMIERBAR" if pages > 15 else "GUT"
         
         # Effizienz
-        efficiency_color = "🔴" if chatbot_priority == "HIGH" else ("🟡" if chatbot_priority == "MEDIUM" else "🟢")
-        efficiency_status = "NIEDRIG" if chatbot_priority == "HIGH" else ("MITTEL" if chatbot_priority == "MEDIUM" else "HOCH")
+        efficiency_color, efficiency_status = _EFFICIENCY_SCORES.get(chatbot_priority, _EFFICIENCY_DEFAULT)
         
         # Wettbewerbsfähigkeit
-        competitive_color = "🟡" if website_check.get('languages', 1) < 2 else "🟢"
-        competitive_status = "AUSBAUFÄHIG" if website_check.get('languages', 1) < 2 else "STARK"
+        competitive_color = "🟡" if languages < 2 else "🟢"
+        competitive_status = "AUSBAUFÄHIG" if languages < 2 else "STARK"
         
         return f"""
             <div class="traffic-light">
@@ -1062,14 +1099,19 @@ class PDFReportGenerator:
     def _generate_website_analysis_html(self, website_check: Dict, crawler_data: Dict) -> str:
         """Generate website analysis table"""
         
-        mobile_status = "✅ Optimiert" if website_check.get('mobile_friendly') else "❌ Nicht optimiert"
-        mobile_class = "status-good" if website_check.get('mobile_friendly') else "status-critical"
+        pages = website_check.get('pages', 0)
+        languages = website_check.get('languages', 1)
+        mobile_friendly = website_check.get('mobile_friendly')
+        has_chatbot = website_check.get('has_chatbot')
         
-        chatbot_status = "❌ Nicht vorhanden" if not website_check.get('has_chatbot') else f"✅ {website_check.get('chatbot_type')}"
-        chatbot_class = "status-critical" if not website_check.get('has_chatbot') else "status-good"
+        mobile_status = "✅ Optimiert" if mobile_friendly else "❌ Nicht optimiert"
+        mobile_class = "status-good" if mobile_friendly else "status-critical"
         
-        complexity = "⚠️ Hoch" if website_check.get('pages', 0) > 20 else "✅ Standard"
-        complexity_class = "status-warning" if website_check.get('pages', 0) > 20 else "status-good"
+        chatbot_status = "❌ Nicht vorhanden" if not has_chatbot else f"✅ {website_check.get('chatbot_type')}"
+        chatbot_class = "status-critical" if not has_chatbot else "status-good"
+        
+        complexity = "⚠️ Hoch" if pages > 20 else "✅ Standard"
+        complexity_class = "status-warning" if pages > 20 else "status-good"
         
         return f"""
         <table class="analysis-table">
@@ -1084,28 +1126,28 @@ class PDFReportGenerator:
             <tbody>
                 <tr>
                     <td><strong>Informationsarchitektur</strong></td>
-                    <td>{website_check.get('pages', 0)} indexierte Seiten</td>
+                    <td>{pages} indexierte Seiten</td>
                     <td><span class="status-icon {complexity_class}">{complexity}</span></td>
-                    <td>{'Hoher Support-Bedarf durch Komplexität' if website_check.get('pages', 0) > 20 else 'Überschaubare Struktur'}</td>
+                    <td>{'Hoher Support-Bedarf durch Komplexität' if pages > 20 else 'Überschaubare Struktur'}</td>
                 </tr>
                 <tr>
                     <td><strong>Mobile Optimierung</strong></td>
                     <td>Responsive Design</td>
                     <td><span class="status-icon {mobile_class}">{mobile_status}</span></td>
-                    <td>{'Nutzerfreundliche mobile Experience' if website_check.get('mobile_friendly') else 'Potenzielle Abbrüche bei mobilen Nutzern'}</td>
+                    <td>{'Nutzerfreundliche mobile Experience' if mobile_friendly else 'Potenzielle Abbrüche bei mobilen Nutzern'}</td>
                 </tr>
                 <tr>
                     <td><strong>Kundenservice-Automatisierung</strong></td>
                     <td>{website_check.get('chatbot_type', 'Keine Automatisierung')}</td>
                     <td><span class="status-icon {chatbot_class}">{chatbot_status}</span></td>
-                    <td>{'Manuelle Bearbeitung aller Anfragen erforderlich' if not website_check.get('has_chatbot') else 'Teilautomatisierte Kundenbetreuung'}</td>
+                    <td>{'Manuelle Bearbeitung aller Anfragen erforderlich' if not has_chatbot else 'Teilautomatisierte Kundenbetreuung'}</td>
                 </tr>
                 <tr>
                     <td><strong>Internationalisierung</strong></td>
-                    <td>{website_check.get('languages', 1)} Sprache(n) erkannt</td>
-                    <td><span class="status-icon {'status-warning' if website_check.get('languages', 1) < 2 else 'status-good'}">
-                        {'⚠️ Monolingual' if website_check.get('languages', 1) < 2 else '✅ Multilingual'}</span></td>
-                    <td>{'Begrenzte Zielgruppenreichweite' if website_check.get('languages', 1) < 2 else 'Internationale Markterschließung möglich'}</td>
+                    <td>{languages} Sprache(n) erkannt</td>
+                    <td><span class="status-icon {'status-warning' if languages < 2 else 'status-good'}">
+                        {'⚠️ Monolingual' if languages < 2 else '✅ Multilingual'}</span></td>
+                    <td>{'Begrenzte Zielgruppenreichweite' if languages < 2 else 'Internationale Markterschließung möglich'}</td>
                 </tr>
             </tbody>
         </table>
@@ -1121,10 +1163,11 @@ class PDFReportGenerator:
             </div>
             """
         
-        html = '<div class="risk-grid">'
+        parts = ['<div class="risk-grid">']
         
         for i, pp in enumerate(pain_points[:4], 1):
-            html += f"""
+            source_refs = f" [{', '.join(source_ids)}]" if (source_ids := pp.get('source_ids')) else ''
+            parts.append(f"""
             <div class="risk-card">
                 <div class="risk-header">
                     <div class="risk-id">RISIKO #{i}</div>
@@ -1137,14 +1180,14 @@ class PDFReportGenerator:
                     </div>
                     <div class="risk-evidence">
                         <strong>Daten-Evidenz:</strong> {pp.get('evidence', 'N/A')}
-                        {' [' + ', '.join(pp.get('source_ids', [])) + ']' if pp.get('source_ids') else ''}
+                        {source_refs}
                     </div>
                 </div>
             </div>
-            """
+            """)
         
-        html += '</div>'
-        return html
+        parts.append('</div>')
+        return "".join(parts)
     
     def _generate_roi_details_html(self, roi_calc: Dict) -> str:
         """Generate ROI calculation table rows with three timeframes"""
@@ -1159,17 +1202,17 @@ class PDFReportGenerator:
             </tr>
             """
         
-        html = ""
+        parts = []
         for calc in calculations:
             source_refs = ""
-            if calc.get('source_ids'):
-                source_refs = " [" + ", ".join(calc.get('source_ids', [])) + "]"
+            if source_ids := calc.get('source_ids'):
+                source_refs = " [" + ", ".join(source_ids) + "]"
             
             monthly_value = calc.get('monthly_value', 0)
             yearly_value = monthly_value * 12
             two_year_value = yearly_value * 2
             
-            html += f"""
+            parts.append(f"""
             <tr>
                 <td class="roi-category">{calc.get('category', 'N/A')}</td>
                 <td class="roi-calculation">{calc.get('calculation', 'N/A')}{source_refs}</td>
@@ -1177,9 +1220,9 @@ class PDFReportGenerator:
                 <td class="roi-value">€ {yearly_value:,.0f}</td>
                 <td class="roi-value">€ {two_year_value:,.0f}</td>
             </tr>
-            """
+            """)
         
-        return html
+        return "".join(parts)
     
     def _generate_waterfall_chart_html(self, roi_calc: Dict) -> str:
         """Generate CSS-based waterfall chart with full category labels"""
@@ -1188,31 +1231,32 @@ class PDFReportGenerator:
         if not calculations:
             return ""
         
-        max_value = max([calc.get('monthly_value', 0) for calc in calculations] + [1])
+        # Percent per EUR, computed once instead of dividing for every bar
+        scale = 100 / max(max(calc.get('monthly_value', 0) for calc in calculations), 1)
         
-        html = """
+        parts = ["""
         <div class="waterfall-container">
             <div class="waterfall-title">Aufschlüsselung der monatlichen Einsparungen</div>
-        """
+        """]
         
         for calc in calculations:
             value = calc.get('monthly_value', 0)
-            width_pct = (value / max_value) * 100
+            width_pct = value * scale
             # Use full category name instead of truncating
             category_name = calc.get('category', 'N/A')
             
-            html += f"""
+            parts.append(f"""
             <div class="waterfall-bar">
                 <div class="bar-label" style="width: 180px; font-size: 10px;">{category_name}</div>
                 <div class="bar-visual" style="width: {width_pct}%"></div>
                 <div class="bar-value">€ {value:,.0f}</div>
             </div>
-            """
+            """)
         
-        html += "</div>"
-        return html
+        parts.append("</div>")
+        return "".join(parts)
     
-    def _generate_recommendations_html(self, recommendations: List[Dict], priority_map: Dict) -> str:
+    def _generate_recommendations_html(self, recommendations: List[Dict]) -> str:
         """Generate recommendation cards with German priority levels"""
         
         if not recommendations:
@@ -1222,17 +1266,15 @@ class PDFReportGenerator:
             </div>
             """
         
-        html = ""
+        parts = []
         
         for rec in recommendations:
             priority = rec.get('priority', 'MEDIUM')
-            priority_label = priority_map.get(priority, 'KURZFRISTIG UMSETZEN')
+            priority_label = _PRIORITY_LABELS.get(priority, 'KURZFRISTIG UMSETZEN')
             # CSS class mapping
-            css_map = {'SOFORT UMSETZEN': 'sofort', 'KURZFRISTIG UMSETZEN': 'kurzfristig', 'STRATEGISCH PLANEN': 'strategisch',
-                       'HOCH': 'sofort', 'MITTEL': 'kurzfristig', 'NIEDRIG': 'strategisch'}
-            priority_css = css_map.get(priority_label, css_map.get(priority, 'kurzfristig'))
+            priority_css = _PRIORITY_CSS.get(priority_label, _PRIORITY_CSS.get(priority, 'kurzfristig'))
             
-            html += f"""
+            parts.append(f"""
             <div class="recommendation-card priority-{priority_css}">
                 <div class="rec-header">
                     <div class="priority-badge badge-{priority_css}">{priority_label}</div>
@@ -1244,9 +1286,9 @@ class PDFReportGenerator:
                     <strong>Umsetzung:</strong> {rec.get('implementation', 'N/A')}
                 </div>
             </div>
-            """
+            """)
         
-        return html
+        return "".join(parts)
     
     def _generate_sources_html(self, sources: List[Dict]) -> str:
         """Generate sources list"""
@@ -1258,19 +1300,15 @@ class PDFReportGenerator:
             </div>
             """
         
-        html = ""
-        
-        for source in sources:
-            source_id = source.get('id', '?')
-            title = source.get('title', 'Unbekannte Quelle')
-            url = source.get('url', '#')
-            year = source.get('year', datetime.now().year)
-            
-            html += f"""
-            <div class="source-item">
-                <span class="source-id">[{source_id}]</span> 
-                {title}, {year} — <a href="{url}" target="_blank" style="color: var(--accent-blue);">{url}</a>
-            </div>
-            """
-        
-        return html
\ No newline at end of file
+        # The pipeline passes the same sources for every report, so the
+        # rendered list is cached on the displayed fields
+        current_year = datetime.now().year
+        return _render_sources_html(tuple(
+            (
+                source.get('id', '?'),
+                source.get('title', 'Unbekannte Quelle'),
+                source.get('url', '#'),
+                source.get('year', current_year)
+            )
+            for source in sources
+        ))
\ No newline at end of file
@@ -3,18 +3,20 @@ CHATPRO AI ANALYZER - PROCESSING PIPELINE V2.0
 Complete analysis pipeline: Crawl → AI Analysis (OpenAI) → PDF → Brevo CRM
 """
 
-import asyncio
 from typing import Dict
 import os
 from datetime import datetime
 import uuid
 
 from .crawler import WebsiteCrawler
-from .analyzer import AIAnalyzer
+from .analyzer import get_analyzer
 from .pdf_generator import PDFReportGenerator
 from .brevo_crm import BrevoCRM
 from .sources_database import SOURCES
 
+# Separator line for the console progress log
+_RULE = "=" * 60
+
 class AnalysisPipeline:
     """
     Complete analysis pipeline with OpenAI GPT-4
@@ -32,7 +34,7 @@ class AnalysisPipeline:
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
-        self.analyzer = AIAnalyzer()
+        self.analyzer = get_analyzer()
         self.pdf_generator = PDFReportGenerator()
         self.brevo_crm = BrevoCRM()
     
@@ -57,14 +59,15 @@ class AnalysisPipeline:
         """
         
         analysis_id = str(uuid.uuid4())
+        short_id = analysis_id[:8]
         start_time = datetime.now()
         
         try:
             # STEP 1: Crawl website (~10-15s)
-            print(f"\n{'='*60}")
-            print(f"[{analysis_id[:8]}] ANALYSIS STARTED")
-            print(f"{'='*60}")
-            print(f"[{analysis_id[:8]}] Step 1/4: Crawling {website_url}...")
+            print(f"\n{_RULE}")
+            print(f"[{short_id}] ANALYSIS STARTED")
+            print(_RULE)
+            print(f"[{short_id}] Step 1/4: Crawling {website_url}...")
             
             crawler = WebsiteCrawler(website_url)
             crawler_data = crawler.crawl()
@@ -82,18 +85,18 @@ class AnalysisPipeline:
                 company_name = crawler_data.get('title', 'Ihr Unternehmen')
             
             crawl_time = (datetime.now() - start_time).total_seconds()
-            print(f"[{analysis_id[:8]}] ✅ Crawling complete ({crawl_time:.1f}s)")
+            print(f"[{short_id}] ✅ Crawling complete ({crawl_time:.1f}s)")
             print(f"  - Pages: {crawler_data.get('page_count', 0)}")
             print(f"  - Chatbot: {'✓ ' + crawler_data.get('chatbot_type', '') if crawler_data.get('has_chatbot') else '✗ None'}")
             print(f"  - Lead Forms: {len(crawler_data.get('lead_forms', []))}")
             
             # STEP 2: AI Analysis with OpenAI GPT-4 (~20-40s)
             analysis_start = datetime.now()
-            print(f"\n[{analysis_id[:8]}] Step 2/4: AI Analysis with OpenAI GPT-4...")
-            print(f"  Model: {self.analyzer.model}")
+            print(f"\n[{short_id}] Step 2/4: AI Analysis with OpenAI GPT-4...")
+            print(f"  Model: {self.analyzer.primary_model} (fallback: {self.analyzer.fallback_model})")
             print(f"  Industry: {industry}")
             
-            analysis_result = self.analyzer.analyze(
+            analysis_result = await self.analyzer.analyze(
                 crawler_data=crawler_data,
                 industry=industry,
                 company_name=company_name
@@ -102,7 +105,7 @@ class AnalysisPipeline:
             analysis_time = (datetime.now() - analysis_start).total_seconds()
             roi_data = analysis_result.get("roi_calculation", {})
             
-            print(f"[{analysis_id[:8]}] ✅ Analysis complete ({analysis_time:.1f}s)")
+            print(f"[{short_id}] ✅ Analysis complete ({analysis_time:.1f}s)")
             print(f"  - Monthly ROI: €{roi_data.get('monthly_roi', 0):,.0f}")
             print(f"  - ROI Multiplier: {roi_data.get('roi_multiplier', 0):.1f}x")
             print(f"  - Priority: {analysis_result.get('chatbot_priority', 'MEDIUM')}")
@@ -111,9 +114,9 @@ class AnalysisPipeline:
             
             # STEP 3: Generate PDF Report (~5-10s)
             pdf_start = datetime.now()
-            print(f"\n[{analysis_id[:8]}] Step 3/4: Generating PDF Report...")
+            print(f"\n[{short_id}] Step 3/4: Generating PDF Report...")
             
-            report_filename = f"chatpro_analyse_{analysis_id[:8]}.pdf"
+            report_filename = f"chatpro_analyse_{short_id}.pdf"
             report_path = os.path.join(self.output_dir, report_filename)
             
             generated_path = self.pdf_generator.generate(
@@ -126,14 +129,14 @@ class AnalysisPipeline:
             )
             
             pdf_time = (datetime.now() - pdf_start).total_seconds()
-            print(f"[{analysis_id[:8]}] ✅ PDF generated ({pdf_time:.1f}s)")
+            print(f"[{short_id}] ✅ PDF generated ({pdf_time:.1f}s)")
             print(f"  - Path: {generated_path}")
             
             # STEP 4: Save to Brevo CRM (NO EMAIL!)
             crm_start = datetime.now()
-            print(f"\n[{analysis_id[:8]}] Step 4/4: Saving to Brevo CRM...")
+            print(f"\n[{short_id}] Step 4/4: Saving to Brevo CRM...")
             
-            crm_result = self.brevo_crm.save_lead(
+            crm_result = await self.brevo_crm.save_lead(
                 email=email,
                 company_name=company_name,
                 website_url=website_url,
@@ -148,23 +151,23 @@ class AnalysisPipeline:
             crm_time = (datetime.now() - crm_start).total_seconds()
             
             if crm_result.get("status") == "success":
-                print(f"[{analysis_id[:8]}] ✅ Lead saved to Brevo ({crm_time:.1f}s)")
+                print(f"[{short_id}] ✅ Lead saved to Brevo ({crm_time:.1f}s)")
                 print(f"  - Contact ID: {crm_result.get('contact_id', 'N/A')}")
                 print(f"  - Tags: {', '.join(crm_result.get('tags_added', []))}")
             else:
-                print(f"[{analysis_id[:8]}] ⚠️  Brevo save failed: {crm_result.get('error')}")
+                print(f"[{short_id}] ⚠️  Brevo save failed: {crm_result.get('error')}")
             
             # FINAL RESULTS
             total_time = (datetime.now() - start_time).total_seconds()
-            print(f"\n{'='*60}")
-            print(f"[{analysis_id[:8]}] ✅ ANALYSIS COMPLETED")
-            print(f"{'='*60}")
+            print(f"\n{_RULE}")
+            print(f"[{short_id}] ✅ ANALYSIS COMPLETED")
+            print(_RULE)
             print(f"Total Time: {total_time:.1f}s")
             print(f"  - Crawl: {crawl_time:.1f}s")
             print(f"  - AI Analysis: {analysis_time:.1f}s")
             print(f"  - PDF Gen: {pdf_time:.1f}s")
             print(f"  - CRM: {crm_time:.1f}s")
-            print(f"{'='*60}\n")
+            print(f"{_RULE}\n")
             
             return {
                 "status": "completed",
@@ -189,12 +192,12 @@ class AnalysisPipeline:
             
         except Exception as e:
             error_time = (datetime.now() - start_time).total_seconds()
-            print(f"\n{'='*60}")
-            print(f"[{analysis_id[:8]}] ❌ ANALYSIS FAILED")
-            print(f"{'='*60}")
+            print(f"\n{_RULE}")
+            print(f"[{short_id}] ❌ ANALYSIS FAILED")
+            print(_RULE)
             print(f"Error: {str(e)}")
             print(f"Time elapsed: {error_time:.1f}s")
-            print(f"{'='*60}\n")
+            print(f"{_RULE}\n")
             
             return {
                 "status": "failed",
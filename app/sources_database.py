@@ -3,7 +3,9 @@ ChatPro AI - Verified Sources Database
 13 verified sources for ROI calculations
 """
 
-from typing import Dict, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Tuple
 
 # Verified Sources Database
 SOURCES = [
@@ -160,6 +162,17 @@ SOURCES = [
     }
 ]
 
+# Freeze the database: entries are shared by the cached lookups below and
+# handed to every request, so they must not be mutable.
+SOURCES = tuple(
+    MappingProxyType({
+        **source,
+        "industries": tuple(source["industries"]),
+        "data": MappingProxyType(source["data"])
+    })
+    for source in SOURCES
+)
+
 
 def get_source_by_id(source_id: str) -> Dict:
     """Get source by ID"""
@@ -169,14 +182,15 @@ def get_source_by_id(source_id: str) -> Dict:
     return {}
 
 
-def get_sources_for_industry(industry: str) -> List[Dict]:
-    """Get all sources relevant for an industry"""
+@lru_cache(maxsize=16)
+def get_sources_for_industry(industry: str) -> Tuple[Dict, ...]:
+    """Get all sources relevant for an industry (cached per industry)"""
     relevant_sources = []
     for source in SOURCES:
         industries = source.get("industries", [])
         if "all" in industries or industry in industries:
             relevant_sources.append(source)
-    return relevant_sources
+    return tuple(relevant_sources)
 
 
 def format_sources_for_prompt(sources: List[Dict]) -> str:
@@ -186,11 +200,17 @@ def format_sources_for_prompt(sources: List[Dict]) -> str:
         formatted.append(f"""
 [Source {source.get('id', 'N/A')}] {source.get('title', 'N/A')}
 URL: {source.get('url', '#')}
-Data: {source.get('data', {})}
+Data: {dict(source.get('data', {}))}
 """)
     return "\n".join(formatted)
 
 
+@lru_cache(maxsize=16)
+def get_sources_prompt_for_industry(industry: str) -> str:
+    """Formatted sources block for an industry, rendered once and reused"""
+    return format_sources_for_prompt(get_sources_for_industry(industry))
+
+
 def get_sources_for_pdf() -> List[Dict]:
     """Get all sources formatted for PDF report"""
     return [